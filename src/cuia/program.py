@@ -6,9 +6,7 @@ from __future__ import annotations
 import asyncio
 from asyncio import Queue
 from dataclasses import dataclass, field
-from typing import Optional
-
-from stransi import Ansi
+from typing import Optional, Text
 
 from .command import Command
 from .messages import Message, Quit
@@ -49,6 +47,14 @@ class Program:
     should_quit: bool = False
     """An indicator that the program should quit."""
 
+    fps: float = 60
+    """The maximum number of frames per second."""
+
+    def __post_init__(self) -> None:
+        """Post-initialization."""
+        if self.fps <= 0:
+            raise ValueError("Program frames per second must be positive.")
+
     async def start(self) -> None:
         """Begin the program."""
         with self.renderer as renderer:
@@ -59,26 +65,35 @@ class Program:
 
                     # Get our first command
                     if command := self.store.start():
-                        await self.obey(command)
+                        self.obey(command)
 
+                    loop = asyncio.get_running_loop()
+                    next_frame = loop.time()
                     while not self.should_quit:
-                        # Show something to the screen as soon as possible
-                        if self.should_render:
-                            renderer.render(Ansi(self.store))
+                        # Expect the user to interact, so get every terminal event
+                        # that arrived since the last frame
+                        while new_event := renderer.next_event():
+                            self.enqueue_message(new_event)
+
+                        # Handle all pending messages before drawing, so that a burst
+                        # of them costs a single frame
+                        while not self.should_quit and (
+                            message := self.dequeue_message()
+                        ):
+                            self.handle_message(message)
+
+                        # Show the result to the screen as soon as possible
+                        if self.should_render and not self.should_quit:
+                            renderer.render(Text(self.store))
+                            renderer.flush()
                             self.should_render = False
 
-                        # Expect the user to interact, so attempt to get the next
-                        # terminal event
-                        if new_event := renderer.next_event():
-                            await self.enqueue_message(new_event)
-
-                        # Handle a next message if available
-                        if message := self.dequeue_message():
-                            await self.handle_message(message)
-
-                        await asyncio.sleep(1 / 60)
+                        # Wait for the next frame, discounting the time spent on this
+                        # one (and never trying to catch up if we are late)
+                        next_frame = max(next_frame + 1 / self.fps, loop.time())
+                        await asyncio.sleep(next_frame - loop.time())
 
-    async def obey(self, command: Command) -> None:
+    def obey(self, command: Command) -> None:
         """
         Spawn a concurrent task to await the command's result.
 
@@ -88,27 +103,28 @@ class Program:
         async def handler() -> None:
             # Await the command and maybe enqueue a message
             if message := await command():
-                await self.enqueue_message(message)
+                self.enqueue_message(message)
 
         # Spawn the task to run the command
         asyncio.create_task(handler())
 
-    async def handle_message(self, message: Message) -> None:
+    def handle_message(self, message: Message) -> None:
         """Handle a message and update the store state."""
         if isinstance(message, Quit):
             self.should_quit = True
 
         # Update the store state and maybe obey a command
         if command := self.store.update(message):
-            await self.obey(command)
+            self.obey(command)
 
         # Remember to render the next time
         self.should_render = True
 
-    async def enqueue_message(self, message: Message) -> None:
+    def enqueue_message(self, message: Message) -> None:
         """Enqueue a message to be handled later."""
         assert self.messages is not None, "Messages queue not initialized"
-        await self.messages.put(message)
+        # The queue is unbounded, so this never has to wait for room
+        self.messages.put_nowait(message)
 
     def dequeue_message(self) -> Optional[Message]:
         """Get the next message if available, None otherwise."""
@@ -1,12 +1,13 @@
 """Renderer facilities."""
 
 
+from .ansi import AnsiRenderer
 from .curses import CursesRenderer
 from .log import LogRenderer
 from .renderer import Renderer
 from .text import TextRenderer
 
-__all__ = ["CursesRenderer", "LogRenderer", "Renderer", "TextRenderer"]
+__all__ = ["AnsiRenderer", "CursesRenderer", "LogRenderer", "Renderer", "TextRenderer"]
 
 
 # TODO: call this module "renderers" (plural)
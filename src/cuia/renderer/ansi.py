@@ -0,0 +1,309 @@
+"""A renderer that writes ANSI escape sequences straight to the terminal."""
+
+
+from __future__ import annotations
+
+import os
+import select
+import termios
+import tty
+from contextlib import contextmanager
+from curses import ascii
+from dataclasses import dataclass, field
+from types import TracebackType
+from typing import Dict, Iterator, Optional, Text, Tuple, Type
+
+from ..messages import Event, Key, Resize, Unsupported
+from .renderer import Renderer
+
+ORD_A = ord("a")
+ENTER_ALTERNATE_SCREEN = "\033[?1049h"
+LEAVE_ALTERNATE_SCREEN = "\033[?1049l"
+DISABLE_LINE_WRAP = "\033[?7l"
+ENABLE_LINE_WRAP = "\033[?7h"
+HIDE_CURSOR = "\033[?25l"
+SHOW_CURSOR = "\033[?25h"
+RESET = "\033[m"
+HOME = "\033[H"
+CLEAR_LINE = "\033[K"
+CLEAR_BELOW = "\033[J"
+
+# Raw mode has no line discipline, so these are the bytes the terminal sends as is
+KEYS: Dict[int, Key] = {
+    **{key: Key.CTRL(ORD_A + key - 1) for key in range(1, ascii.SP)},
+    **{key: Key.CHAR(key) for key in range(ascii.SP + 1, ascii.DEL)},
+    ascii.NUL: Key.NULL,  # type: ignore
+    ascii.TAB: Key.TAB,  # type: ignore
+    ascii.CR: Key.ENTER,  # type: ignore
+    ascii.NL: Key.ENTER,  # type: ignore
+    ascii.ESC: Key.ESCAPE,  # type: ignore
+    ascii.SP: Key.SPACE,  # type: ignore
+    ascii.BS: Key.BACKSPACE,  # type: ignore
+    ascii.DEL: Key.BACKSPACE,  # type: ignore
+}
+
+# Keys sent as an escape and a final character, either after `[` (and maybe some
+# modifiers, as in `\033[1;5A` for ctrl+up) or after `O`
+FINAL_KEYS: Dict[Text, Key] = {
+    "A": Key.UP,  # type: ignore
+    "B": Key.DOWN,  # type: ignore
+    "C": Key.RIGHT,  # type: ignore
+    "D": Key.LEFT,  # type: ignore
+    "H": Key.HOME,  # type: ignore
+    "F": Key.END,  # type: ignore
+    "P": Key.F(1),
+    "Q": Key.F(2),
+    "R": Key.F(3),
+    "S": Key.F(4),
+    "Z": Key.SHIFT(Key.TAB),  # type: ignore
+}
+
+# Keys sent as an escape, `[`, a number (and maybe some modifiers) and a tilde
+TILDE_KEYS: Dict[int, Key] = {
+    1: Key.HOME,  # type: ignore
+    2: Key.INSERT,  # type: ignore
+    3: Key.DELETE,  # type: ignore
+    4: Key.END,  # type: ignore
+    5: Key.PAGE_UP,  # type: ignore
+    6: Key.PAGE_DOWN,  # type: ignore
+    7: Key.HOME,  # type: ignore
+    8: Key.END,  # type: ignore
+    **{10 + n: Key.F(n) for n in range(1, 6)},
+    **{11 + n: Key.F(n) for n in range(6, 11)},
+    23: Key.F(11),
+    24: Key.F(12),
+}
+
+
+def decode(data: bytes, complete: bool) -> Optional[Tuple[Event, int]]:
+    """
+    Decode the first key in some terminal input.
+
+    Return the event and the number of bytes it took. If the input ends in the
+    middle of a key and more of it may still arrive (`complete` is False), return
+    None instead.
+    """
+    if data[0] == ascii.ESC:
+        return decode_escape(data, complete)
+    if data[0] in KEYS:
+        return KEYS[data[0]], 1
+
+    # Anything else starts a multibyte UTF-8 character, whose first byte tells its
+    # length
+    size = 2 if data[0] < 0xE0 else 3 if data[0] < 0xF0 else 4
+    if len(data) < size and not complete:
+        return None
+    try:
+        char = data[:size].decode()
+    except UnicodeDecodeError:
+        return Unsupported(data[:1]), 1
+    if not char.isprintable():
+        return Unsupported(data[:size]), size
+    return Key.CHAR(char), size
+
+
+def decode_escape(data: bytes, complete: bool) -> Optional[Tuple[Event, int]]:
+    """Decode a key that starts with an escape byte."""
+    if len(data) == 1:
+        return (Key.ESCAPE, 1) if complete else None  # type: ignore
+
+    # An escape and `[` or `O` alone are alt modified keys, but they usually start
+    # the sequence of some special key
+    if data[1] == ord("[") and (len(data) > 2 or not complete):
+        return decode_csi(data, complete)
+    if data[1] == ord("O") and (len(data) > 2 or not complete):
+        if len(data) == 2:
+            return None
+        key = FINAL_KEYS.get(chr(data[2]))
+        return (key or Unsupported(data[:3])), 3
+
+    # Alt+other key
+    if (decoded := decode(data[1:], complete)) is None:
+        return None
+    event, size = decoded
+    if not isinstance(event, Key):
+        return Unsupported(data[: size + 1]), size + 1
+    return Key.ALT(event), size + 1
+
+
+def decode_csi(data: bytes, complete: bool) -> Optional[Tuple[Event, int]]:
+    """Decode a control sequence: an escape, `[`, parameters and a final byte."""
+    for end in range(2, len(data)):
+        if 0x40 <= data[end] <= 0x7E:
+            key = csi_key(data[2:end].decode(), chr(data[end]))
+            return (key or Unsupported(data[: end + 1])), end + 1
+        if not 0x20 <= data[end] <= 0x3F:
+            # Not a valid control sequence, so report what we got so far
+            return Unsupported(data[:end]), end
+    return (Unsupported(data), len(data)) if complete else None
+
+
+def csi_key(parameters: Text, final: Text) -> Optional[Key]:
+    """Return the key of a control sequence, if it is a known one."""
+    numbers = parameters.split(";") if parameters else []
+    if not all(number.isdigit() for number in numbers):
+        return None
+
+    if final == "~":
+        key = TILDE_KEYS.get(int(numbers[0])) if numbers else None
+    else:
+        key = FINAL_KEYS.get(final)
+
+    if key is None or len(numbers) < 2:
+        return key
+    return modify(key, int(numbers[1]) - 1)
+
+
+def modify(key: Key, modifiers: int) -> Key:
+    """Apply the modifiers in the bit mask of an xterm control sequence to a key."""
+    if modifiers & 1:
+        key = Key.SHIFT(key)
+    if modifiers & 2:
+        key = Key.ALT(key)
+    if modifiers & 4:
+        key = Key.CTRL(key)
+    if modifiers & 8:
+        key = Key.META(key)
+    return key
+
+
+@dataclass
+class AnsiRenderer(Renderer):
+    """
+    A renderer that writes ANSI escape sequences straight to the terminal.
+
+    Screens are not translated into curses calls: each one is encoded and written
+    with a single system call. This relies on the terminal understanding the
+    escape sequences in the screen, which is the case for any modern terminal
+    emulator.
+
+    Examples
+    --------
+    >>> with AnsiRenderer() as renderer:
+    ...     renderer.render("Hello, world!")  # doctest: +SKIP
+    """
+
+    stdin: int = 0
+    """The file descriptor to read terminal events from."""
+
+    stdout: int = 1
+    """The file descriptor to write screens to."""
+
+    last_screen: Optional[Text] = field(default=None, init=False, repr=False)
+    """The most recently rendered screen, if it is still what the terminal shows."""
+
+    pending: bytes = field(default=b"", init=False, repr=False)
+    """Input read from the terminal but not decoded into events yet."""
+
+    size: Optional[os.terminal_size] = field(default=None, init=False, repr=False)
+    """The most recently seen size of the terminal, if it is a terminal."""
+
+    def render(self, screen: Text) -> None:
+        """Render a screen."""
+        # Nothing to write if the terminal already shows exactly this
+        if screen == self.last_screen:
+            return
+        self.last_screen = screen
+
+        # Lines below the terminal would scroll it, so drop them. Lines wider than it
+        # are cut by the terminal itself, since line wrapping is off.
+        size = self.terminal_size()
+        if size is not None and screen.count("\n") >= size.lines:
+            screen = "\n".join(screen.split("\n", size.lines)[: size.lines])
+
+        # Draw over the previous frame instead of clearing the screen first, so that
+        # nothing flickers: clear the rest of each line and everything below the last
+        # one. Output post-processing is off in raw mode, so line feeds need an
+        # explicit carriage return.
+        self.write(
+            RESET
+            + HOME
+            + screen.replace("\n", CLEAR_LINE + "\r\n")
+            + CLEAR_LINE
+            + CLEAR_BELOW
+        )
+
+    def next_event(self) -> Optional[Event]:
+        """Attempt to get the next terminal event."""
+        # Terminals do not report resizes as input, so look for them ourselves
+        size = self.terminal_size()
+        if size != self.size:
+            self.size = size
+            if size is not None:
+                # The terminal contents no longer match the last screen, so redraw it
+                self.last_screen = None
+                return Resize(size.lines, size.columns)
+
+        if not self.pending and not self.read():
+            return None
+
+        # A single read may hold several keys (fast typing, key repeat or a paste),
+        # so decode one at a time and keep the rest for the next calls. A key may
+        # also be split between reads, so ask for more input while it is incomplete.
+        decoded = decode(self.pending, complete=False)
+        while decoded is None:
+            decoded = decode(self.pending, complete=not self.read())
+
+        event, length = decoded
+        self.pending = self.pending[length:]
+        return event
+
+    def read(self) -> bool:
+        """Read whatever input is available without waiting, if any."""
+        ready, _, _ = select.select([self.stdin], [], [], 0)
+        if not ready:
+            return False
+
+        data = os.read(self.stdin, 1024)
+        self.pending += data
+        return bool(data)
+
+    def terminal_size(self) -> Optional[os.terminal_size]:
+        """Return the size of the terminal, or None if the output is not one."""
+        try:
+            return os.get_terminal_size(self.stdout)
+        except OSError:
+            return None
+
+    def write(self, text: Text) -> None:
+        """Write text to the terminal, bypassing any buffering."""
+        data = memoryview(text.encode())
+        while data:
+            written = os.write(self.stdout, data)
+            data = data[written:]
+
+    def __enter__(self) -> AnsiRenderer:
+        """Enter context."""
+        self.write(ENTER_ALTERNATE_SCREEN + DISABLE_LINE_WRAP)
+        self.last_screen = None
+        self.size = self.terminal_size()
+        return self
+
+    def __exit__(
+        self,
+        exctype: Optional[Type[BaseException]],
+        excinst: Optional[BaseException],
+        exctb: Optional[TracebackType],
+    ) -> Optional[bool]:
+        """Exit context."""
+        self.write(RESET + ENABLE_LINE_WRAP + LEAVE_ALTERNATE_SCREEN)
+        return None
+
+    @contextmanager
+    def into_raw_mode(self) -> Iterator[AnsiRenderer]:
+        """Enter raw mode."""
+        attributes = termios.tcgetattr(self.stdin)
+        tty.setraw(self.stdin)
+        try:
+            yield self
+        finally:
+            termios.tcsetattr(self.stdin, termios.TCSADRAIN, attributes)
+
+    @contextmanager
+    def hide_cursor(self) -> Iterator[AnsiRenderer]:
+        """Hide the cursor."""
+        self.write(HIDE_CURSOR)
+        try:
+            yield self
+        finally:
+            self.write(SHOW_CURSOR)
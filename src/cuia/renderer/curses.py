@@ -4,11 +4,12 @@
 from __future__ import annotations
 
 import curses
+import re
 from contextlib import contextmanager
 from curses import ascii
 from dataclasses import dataclass, field
 from types import TracebackType
-from typing import Iterator, Optional, Text, Type
+from typing import Dict, Iterator, Optional, Text, Tuple, Type, Union
 
 from cusser import Cusser
 
@@ -16,6 +17,115 @@ from ..messages import Event, Key, Resize, Unsupported
 from .renderer import Renderer
 
 ORD_A = ord("a")
+TABSIZE = 8  # curses' default
+RESET = "\033[m"
+ESCAPE_SEQUENCE = re.compile(r"\033\[[0-?]*[ -/]*[@-~]")
+
+# Keys that map to a fixed event, so that looking them up needs no branching.
+# Events are built once and shared, which is fine since they are immutable.
+KEYS: Dict[int, Key] = {
+    # Control+other keys (but escape, which may start an alt modified key)
+    **{
+        key: Key.CTRL(ORD_A + key - 1) for key in range(1, ascii.SP) if key != ascii.ESC
+    },
+    # Printable character keys
+    **{key: Key.CHAR(key) for key in range(ascii.SP + 1, ascii.DEL)},
+    # Arrow, home, end, page and insert keys
+    curses.KEY_LEFT: Key.LEFT,  # type: ignore
+    curses.KEY_RIGHT: Key.RIGHT,  # type: ignore
+    curses.KEY_UP: Key.UP,  # type: ignore
+    curses.KEY_DOWN: Key.DOWN,  # type: ignore
+    curses.KEY_HOME: Key.HOME,  # type: ignore
+    curses.KEY_END: Key.END,  # type: ignore
+    curses.KEY_PPAGE: Key.PAGE_UP,  # type: ignore
+    curses.KEY_NPAGE: Key.PAGE_DOWN,  # type: ignore
+    curses.KEY_IC: Key.INSERT,  # type: ignore
+    # Function keys, plain and shift, control, control+shift and alt modified
+    **{curses.KEY_F0 + n: Key.F(n) for n in range(13)},
+    **{curses.KEY_F12 + n: Key.SHIFT(Key.F(n)) for n in range(1, 13)},
+    **{curses.KEY_F24 + n: Key.CTRL(Key.F(n)) for n in range(1, 13)},
+    **{curses.KEY_F36 + n: Key.CTRL(Key.SHIFT(Key.F(n))) for n in range(1, 13)},
+    **{curses.KEY_F48 + n: Key.ALT(Key.F(n)) for n in range(1, 13)},
+    # Backspace key (unreliable, so we also accept the ASCII BS charater).
+    ascii.BS: Key.BACKSPACE,  # type: ignore
+    curses.KEY_BACKSPACE: Key.BACKSPACE,  # type: ignore
+    # Enter or send key (unreliable, so we also accept carriage returns and
+    # line feeds. See <https://stackoverflow.com/a/32255045/4039050>.
+    ascii.CR: Key.ENTER,  # type: ignore
+    ascii.NL: Key.ENTER,  # type: ignore
+    curses.KEY_ENTER: Key.ENTER,  # type: ignore
+    # Tab, delete character, space and null keys
+    ascii.TAB: Key.TAB,  # type: ignore
+    ascii.DEL: Key.DELETE,  # type: ignore
+    curses.KEY_DC: Key.DELETE,  # type: ignore
+    ascii.SP: Key.SPACE,  # type: ignore
+    ascii.NUL: Key.NULL,  # type: ignore
+    # Shift modified keys (shift+up and shift+down scroll one backward and forward)
+    curses.KEY_SLEFT: Key.SHIFT(Key.LEFT),  # type: ignore
+    curses.KEY_SRIGHT: Key.SHIFT(Key.RIGHT),  # type: ignore
+    curses.KEY_SR: Key.SHIFT(Key.UP),  # type: ignore
+    curses.KEY_SF: Key.SHIFT(Key.DOWN),  # type: ignore
+    curses.KEY_SHOME: Key.SHIFT(Key.HOME),  # type: ignore
+    curses.KEY_SEND: Key.SHIFT(Key.END),  # type: ignore
+    curses.KEY_SPREVIOUS: Key.SHIFT(Key.PAGE_UP),  # type: ignore
+    curses.KEY_SNEXT: Key.SHIFT(Key.PAGE_DOWN),  # type: ignore
+    curses.KEY_BTAB: Key.SHIFT(Key.TAB),  # type: ignore
+    curses.KEY_SDC: Key.SHIFT(Key.DELETE),  # type: ignore
+}
+
+
+def fit(line: Text, room: int, width: int) -> Tuple[int, int]:
+    """
+    Return how many characters of a line fit in some room, and the cells they take.
+
+    Tabs move the cursor to the next tab stop, or to the start of the next row if the
+    current one has no stops left, as curses does.
+    """
+    if "\t" not in line:
+        length = min(len(line), room)
+        return length, length
+
+    position = 0
+    for length, char in enumerate(line):
+        if char == "\t":
+            column = position % width
+            step = min(TABSIZE - column % TABSIZE, width - column)
+        else:
+            step = 1
+        if position + step > room:
+            return length, position
+        position += step
+    return len(line), position
+
+
+def clip(screen: Text, height: int, width: int) -> Text:
+    """
+    Drop whatever part of a screen would not fit in a window of the given size.
+
+    Lines wider than the window wrap onto the next rows, so they take more than one.
+    Escape sequences take no room, tabs take up to the next tab stop and every other
+    character is taken to be a single column wide. A line that does not fit is cut if
+    it has no escape sequences, and dropped otherwise.
+    """
+    lines = []
+    rows = 0
+    for line in screen.split("\n", height)[:height]:
+        if rows == height:
+            break
+
+        # After writing a line, the cursor stands right after its last character,
+        # which must still be inside the window
+        room = (height - rows) * width - 1
+        plain = ESCAPE_SEQUENCE.sub("", line) if "\033" in line else line
+        length, cells = fit(plain, room, width)
+        if length < len(plain):
+            if "\033" not in line:
+                lines.append(line[:length])
+            break
+
+        lines.append(line)
+        rows += cells // width + 1
+    return "\n".join(lines)
 
 
 @dataclass
@@ -26,31 +136,83 @@ class CursesRenderer(Renderer):
     Examples
     --------
     >>> with CursesRenderer() as renderer:
-    ...     renderer.render("Hello, world!")  # doctest: +SKIP
+    ...     renderer.render("Hello, world!")
+    ...     renderer.flush()  # doctest: +SKIP
     """
 
-    stdscr: Cusser = field(default_factory=lambda: Cusser(curses.initscr()))
+    stdscr: Optional[Cusser] = None
+    """
+    The curses window to draw on, wrapped so that it understands ANSI escapes.
+
+    If not given, `window` is wrapped (or a new screen is initialized if that is not
+    given either).
+    """
+
+    window: Optional[Union[curses.window, Cusser]] = None
+    """
+    The same window, unwrapped, for whatever needs no ANSI translation.
+
+    If not given, this is `stdscr` itself.
+    """
+
+    last_screen: Optional[Text] = field(default=None, init=False, repr=False)
+    """The most recently rendered screen, if it is still what the window shows."""
 
     def __post_init__(self) -> None:
         """Post-initialization."""
         if not self.fullscreen:
             raise ValueError("CursesRenderer only supports fullscreen mode.")
 
+        if self.stdscr is None:
+            if self.window is None:
+                self.window = curses.initscr()
+            self.stdscr = Cusser(self.window)
+        elif self.window is None:
+            # Cusser forwards everything else to the window it wraps, so it can stand
+            # in for it (only a bit slower)
+            self.window = self.stdscr
+
     def render(self, screen: Text) -> None:
         """Render a screen."""
-        self.stdscr.erase()
-        self.stdscr.addstr("\033[m")
-        self.stdscr.addstr(screen)
-        self.stdscr.noutrefresh()
+        # Nothing to do if the window already shows exactly this
+        if screen == self.last_screen:
+            return
+        self.last_screen = screen
+
+        window, stdscr = self.window, self.stdscr
+        assert window is not None and stdscr is not None, "Window not initialized"
+        window.erase()
+        window.attrset(curses.A_NORMAL)
+
+        # Whatever falls below the window would never be seen, and writing it makes
+        # curses raise an error, so drop it before doing any work on it
+        screen = clip(screen, *window.getmaxyx())
+
+        # Plain text needs no ANSI translation, so write everything up to the first
+        # escape sequence straight to the window. The rest goes to cusser in a
+        # single write that also resets its own idea of the current attributes.
+        start = screen.find("\033")
+        if start == -1:
+            window.addstr(screen)
+        else:
+            if start:
+                window.addstr(screen[:start])
+            stdscr.addstr(RESET + screen[start:])
+        window.noutrefresh()
+
+    def flush(self) -> None:
+        """Send everything rendered so far to the terminal."""
         curses.doupdate()
 
-    def next_event(self) -> Optional[Event]:  # noqa: C901
+    def next_event(self) -> Optional[Event]:
         """Attempt to get the next terminal event."""
         # The strategy used is inspired
         # from <https://stackoverflow.com/a/32794353/4039050>.
 
+        window = self.window
+        assert window is not None, "Window not initialized"
         try:
-            key = self.stdscr.get_wch()
+            key = window.get_wch()
         except curses.error:
             return None
 
@@ -59,157 +221,40 @@ class CursesRenderer(Renderer):
 
         # Window resize event
         if key == curses.KEY_RESIZE:
-            return Resize(*self.stdscr.getmaxyx())
-
-        # Left-arrow key
-        if key == curses.KEY_LEFT:
-            return Key.LEFT  # type: ignore
-
-        # Right-arrow key
-        if key == curses.KEY_RIGHT:
-            return Key.RIGHT  # type: ignore
-
-        # Up-arrow key
-        if key == curses.KEY_UP:
-            return Key.UP  # type: ignore
-
-        # Down-arrow key
-        if key == curses.KEY_DOWN:
-            return Key.DOWN  # type: ignore
-
-        # Home key (upward+left arrow)
-        if key == curses.KEY_HOME:
-            return Key.HOME  # type: ignore
-
-        # End key
-        if key == curses.KEY_END:
-            return Key.END  # type: ignore
-
-        # Previous page key
-        if key == curses.KEY_PPAGE:
-            return Key.PAGE_UP  # type: ignore
-
-        # Next page key
-        if key == curses.KEY_NPAGE:
-            return Key.PAGE_DOWN  # type: ignore
-
-        # Insert char or enter insert mode key
-        if key == curses.KEY_IC:
-            return Key.INSERT  # type: ignore
-
-        # Function keys
-        if curses.KEY_F0 <= key <= curses.KEY_F12:
-            return Key.F(key - curses.KEY_F0)
+            # The window contents no longer match the last screen, so redraw it
+            self.last_screen = None
+            return Resize(*window.getmaxyx())
 
-        # Shift+function key
-        if curses.KEY_F13 <= key <= curses.KEY_F24:
-            return Key.SHIFT(Key.F(key - curses.KEY_F12))
-
-        # Control+function key
-        if curses.KEY_F25 <= key <= curses.KEY_F36:
-            return Key.CTRL(Key.F(key - curses.KEY_F24))
-
-        # Control+shift+function key
-        if curses.KEY_F37 <= key <= curses.KEY_F48:
-            return Key.CTRL(Key.SHIFT(Key.F(key - curses.KEY_F36)))
-
-        # Alt+function key
-        if curses.KEY_F49 <= key <= curses.KEY_F60:
-            return Key.ALT(Key.F(key - curses.KEY_F48))
-
-        # Backspace key (unreliable, so we also accept the ASCII BS charater).
-        if key in {ascii.BS, curses.KEY_BACKSPACE}:
-            return Key.BACKSPACE  # type: ignore
-
-        # Enter or send key (unreliable, so we also accept carriage returns and
-        # line feeds. See <https://stackoverflow.com/a/32255045/4039050>.
-        if key in {ascii.CR, ascii.NL, curses.KEY_ENTER}:
-            return Key.ENTER  # type: ignore
-
-        # Tab key
-        if key == ascii.TAB:
-            return Key.TAB  # type: ignore
-
-        # Delete character key
-        if key in {ascii.DEL, curses.KEY_DC}:
-            return Key.DELETE  # type: ignore
-
-        # Space key
-        if key == ascii.SP:
-            return Key.SPACE  # type: ignore
-
-        # Null key
-        if key == ascii.NUL:
-            return Key.NULL  # type: ignore
+        # Keys that always produce the same event
+        if (event := KEYS.get(key)) is not None:
+            return event
 
         if key == ascii.ESC:
-            # This assumes no delay is set to True
-            if (next_key := self.next_event()) is None:
-                # Escape key
-                return Key.ESCAPE  # type: ignore
-
-            # Alt+other key
-            assert isinstance(next_key, Key), f"unexpected type: {type(next_key)}"
-            return Key.ALT(next_key)
-
-        # Control+other key
-        if ascii.isctrl(key):
-            return Key.CTRL(ORD_A + key - 1)
-
-        # Shift+left-arrow key
-        if key == curses.KEY_SLEFT:
-            return Key.SHIFT(Key.LEFT)  # type: ignore
+            return self.escape_event()
 
-        # Shift+right-arrow key
-        if key == curses.KEY_SRIGHT:
-            return Key.SHIFT(Key.RIGHT)  # type: ignore
-
-        # Shift+up-arrow key (scroll one backward)
-        if key == curses.KEY_SR:
-            return Key.SHIFT(Key.UP)  # type: ignore
-
-        # Shift+down-arrow key (scroll one forward)
-        if key == curses.KEY_SF:
-            return Key.SHIFT(Key.DOWN)  # type: ignore
-
-        # Shift+home key
-        if key == curses.KEY_SHOME:
-            return Key.SHIFT(Key.HOME)  # type: ignore
-
-        # Shift+end key
-        if key == curses.KEY_SEND:
-            return Key.SHIFT(Key.END)  # type: ignore
-
-        # Shift+previous page key
-        if key == curses.KEY_SPREVIOUS:
-            return Key.SHIFT(Key.PAGE_UP)  # type: ignore
-
-        # Shift+next page key
-        if key == curses.KEY_SNEXT:
-            return Key.SHIFT(Key.PAGE_DOWN)  # type: ignore
-
-        # Shift+tab key (back tab)
-        if key == curses.KEY_BTAB:
-            return Key.SHIFT(Key.TAB)  # type: ignore
-
-        # Shift+delete character key
-        if key == curses.KEY_SDC:
-            return Key.SHIFT(Key.DELETE)  # type: ignore
-
-        # Meta+other key (might also be some special key)
-        if ascii.ismeta(key):
+        # Meta+other key (might also be some special key). This is curses.ascii's
+        # ismeta, inlined to save a function call per key.
+        if key > ascii.DEL:
             return Key.META(key)
 
-        # Any other printable character key
-        if ascii.isprint(key):
-            return Key.CHAR(key)
-
         return Unsupported(curses.keyname(key))
 
+    def escape_event(self) -> Event:
+        """Return the event of an escape, which may start an alt modified key."""
+        # This assumes no delay is set to True
+        if (next_key := self.next_event()) is None:
+            # Escape key
+            return Key.ESCAPE  # type: ignore
+
+        # Alt+other key
+        assert isinstance(next_key, Key), f"unexpected type: {type(next_key)}"
+        return Key.ALT(next_key)
+
     def __enter__(self) -> CursesRenderer:
         """Enter context."""
-        self.stdscr.keypad(True)
-        self.stdscr.nodelay(True)
+        assert self.window is not None, "Window not initialized"
+        self.window.keypad(True)
+        self.window.nodelay(True)
         return self
 
     def __exit__(
@@ -219,8 +264,9 @@ class CursesRenderer(Renderer):
         exctb: Optional[TracebackType],
     ) -> Optional[bool]:
         """Exit context."""
-        self.stdscr.nodelay(False)
-        self.stdscr.keypad(False)
+        assert self.window is not None, "Window not initialized"
+        self.window.nodelay(False)
+        self.window.keypad(False)
         curses.endwin()
         return None
 
@@ -238,8 +284,9 @@ class CursesRenderer(Renderer):
     @contextmanager
     def hide_cursor(self) -> Iterator[CursesRenderer]:
         """Hide the cursor."""
-        curses.curs_set(0)
+        # Remember the previous visibility so that we restore it as it was
+        visibility = curses.curs_set(0)
         try:
             yield self
         finally:
-            curses.curs_set(1)
+            curses.curs_set(visibility)
@@ -24,7 +24,8 @@ class LogRenderer(Renderer, Generic[R]):
     --------
     >>> from cuia.renderer import CursesRenderer, LogRenderer
     >>> with LogRenderer(CursesRenderer()) as renderer:
-    ...     renderer.render("Hello, world!")  # doctest: +SKIP
+    ...     renderer.render("Hello, world!")
+    ...     renderer.flush()  # doctest: +SKIP
     """
 
     renderer: R
@@ -48,6 +49,10 @@ class LogRenderer(Renderer, Generic[R]):
         """Render a screen."""
         return self.renderer.render(screen)
 
+    def flush(self) -> None:
+        """Send everything rendered so far to the terminal."""
+        return self.renderer.flush()
+
     def next_event(self) -> Optional[Event]:
         """Attempt to get the next terminal event."""
         return self.renderer.next_event()
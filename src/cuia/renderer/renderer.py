@@ -7,7 +7,7 @@ from abc import ABC, abstractmethod
 from contextlib import contextmanager
 from dataclasses import dataclass, field
 from types import TracebackType
-from typing import ContextManager, Iterator, Optional, Text, Type, TypeVar
+from typing import Iterator, Optional, Text, Type, TypeVar
 
 from ..messages import Event
 
@@ -15,7 +15,7 @@ R = TypeVar("R", bound="Renderer")
 
 
 @dataclass  # type: ignore
-class Renderer(ContextManager["Renderer"], ABC):
+class Renderer(ABC):
     """Renderer base class."""
 
     fullscreen: bool = field(default=True, init=False)
@@ -26,6 +26,14 @@ class Renderer(ContextManager["Renderer"], ABC):
         """Render a screen."""
         raise NotImplementedError("You must implement this method")
 
+    def flush(self) -> None:
+        """
+        Send everything rendered so far to the terminal.
+
+        Renderers may defer output until this is called, so that several updates
+        reach the terminal at once. The default implementation does nothing.
+        """
+
     @abstractmethod
     def next_event(self) -> Optional[Event]:
         """Attempt to get the next terminal event."""
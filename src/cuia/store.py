@@ -9,6 +9,8 @@ from . import command
 from .command import Command
 from .messages import Key, Message
 
+QUIT_KEYS = frozenset({Key.CTRL("c"), Key.CHAR("q")})
+
 
 @dataclass  # type: ignore
 class Store(ABC):
@@ -36,7 +38,7 @@ class Store(ABC):
         The default implementation terminates the program if the user presses Ctrl-C,
         but does nothing else other than that.
         """
-        if isinstance(message, Key) and message in {Key.CTRL("c"), Key.CHAR("q")}:
+        if isinstance(message, Key) and message in QUIT_KEYS:
             # The user pressed either Ctrl-C or Q, so we quit the application.
             return command.quit
         return None
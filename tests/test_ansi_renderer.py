@@ -0,0 +1,182 @@
+"""Tests for the ANSI renderer."""
+
+
+import fcntl
+import os
+import pty
+import struct
+import termios
+from pathlib import Path
+from typing import Iterator, List
+
+import pytest
+
+import cuia
+from cuia.messages import Event, Key, Resize, Unsupported
+
+
+def test_context_sequences(tmp_path: Path) -> None:
+    """Test the sequences written when entering and exiting the renderer."""
+    path = tmp_path / "screen"
+    with open(path, "wb") as file:
+        with cuia.renderer.AnsiRenderer(stdout=file.fileno()) as renderer:
+            with renderer.hide_cursor():
+                pass
+
+    assert path.read_bytes() == (
+        b"\033[?1049h\033[?7l"  # Enter the alternate screen, without line wrap
+        b"\033[?25l\033[?25h"  # Hide the cursor and show it again
+        b"\033[m\033[?7h\033[?1049l"  # Reset and leave the alternate screen
+    )
+
+
+def test_render_writes_frame(tmp_path: Path) -> None:
+    """Test that a screen is drawn over the last one, line by line."""
+    path = tmp_path / "screen"
+    with open(path, "wb") as file:
+        renderer = cuia.renderer.AnsiRenderer(stdout=file.fileno())
+        renderer.render("Hello,\nworld!")
+
+    assert path.read_bytes() == b"\033[m\033[HHello,\033[K\r\nworld!\033[K\033[J"
+
+
+def test_render_skips_same_frame(tmp_path: Path) -> None:
+    """Test that rendering the same screen twice writes it only once."""
+    path = tmp_path / "screen"
+    with open(path, "wb") as file:
+        renderer = cuia.renderer.AnsiRenderer(stdout=file.fileno())
+        renderer.render("Hello, world!")
+        renderer.render("Hello, world!")
+
+    assert path.read_bytes().count(b"Hello, world!") == 1
+
+
+@pytest.fixture
+def pipe() -> Iterator[List[int]]:
+    """Return the read and write ends of a pipe, closing them afterwards."""
+    fds = list(os.pipe())
+    yield fds
+    for fd in fds:
+        os.close(fd)
+
+
+def events(pipe: List[int], data: bytes) -> List[Event]:
+    """Feed some input to a renderer and return every event it reports."""
+    renderer = cuia.renderer.AnsiRenderer(stdin=pipe[0], stdout=pipe[1])
+    os.write(pipe[1], data)
+    result = []
+    while (event := renderer.next_event()) is not None:
+        result.append(event)
+    return result
+
+
+def test_next_event_without_input(pipe: List[int]) -> None:
+    """Test that no event is reported while there is no input."""
+    assert events(pipe, b"") == []
+
+
+def test_next_event_keeps_every_key(pipe: List[int]) -> None:
+    """Test that several keys read at once are reported one by one."""
+    assert events(pipe, b"ab\x03q") == [
+        Key.CHAR("a"),
+        Key.CHAR("b"),
+        Key.CTRL("c"),
+        Key.CHAR("q"),
+    ]
+
+
+def test_next_event_decodes_utf8(pipe: List[int]) -> None:
+    """Test that multibyte characters are reported as a single key."""
+    assert events(pipe, "é€".encode()) == [Key.CHAR("é"), Key.CHAR("€")]
+
+
+def test_next_event_decodes_special_keys(pipe: List[int]) -> None:
+    """Test that common escape sequences are reported as special keys."""
+    data = b"\x1b[A\x1bOB\x1b[H\x1b[5~\x1bOP\x1b[24~\x1b[Z\r\x7f"
+    assert events(pipe, data) == [
+        Key.UP,
+        Key.DOWN,
+        Key.HOME,
+        Key.PAGE_UP,
+        Key.F(1),
+        Key.F(12),
+        Key.SHIFT(Key.TAB),  # type: ignore
+        Key.ENTER,
+        Key.BACKSPACE,
+    ]
+
+
+def test_next_event_decodes_modifiers(pipe: List[int]) -> None:
+    """Test that modified special keys keep their modifiers."""
+    assert events(pipe, b"\x1b[1;5A\x1b[3;2~\x1b[1;6P") == [
+        Key.CTRL(Key.UP),  # type: ignore
+        Key.SHIFT(Key.DELETE),  # type: ignore
+        Key.CTRL(Key.SHIFT(Key.F(1))),
+    ]
+
+
+def test_next_event_decodes_alt_keys(pipe: List[int]) -> None:
+    """Test that an escape before a key is reported as an alt modified key."""
+    assert events(pipe, b"\x1bx\x1b\x1b[A\x1b[") == [
+        Key.ALT(Key.CHAR("x")),
+        Key.ALT(Key.UP),  # type: ignore
+        Key.ALT(Key.CHAR("[")),
+    ]
+
+
+def test_next_event_decodes_escape(pipe: List[int]) -> None:
+    """Test that a lone escape is reported as the escape key."""
+    assert events(pipe, b"\x1b") == [Key.ESCAPE]
+
+
+def test_next_event_reports_unknown_sequences(pipe: List[int]) -> None:
+    """Test that unknown sequences are reported without losing other keys."""
+    assert events(pipe, b"\x1b[99~a") == [Unsupported(b"\x1b[99~"), Key.CHAR("a")]
+
+
+def test_next_event_waits_for_split_keys(pipe: List[int]) -> None:
+    """Test that a key split between reads is decoded once it is complete."""
+    renderer = cuia.renderer.AnsiRenderer(stdin=pipe[0], stdout=pipe[1])
+    renderer.pending = b"\x1b["
+    os.write(pipe[1], b"B")
+    assert renderer.next_event() == Key.DOWN
+
+
+@pytest.fixture
+def terminal() -> Iterator[List[int]]:
+    """Return both ends of a pseudo-terminal, closing them afterwards."""
+    fds = list(pty.openpty())
+    yield fds
+    for fd in fds:
+        os.close(fd)
+
+
+def resize(fd: int, height: int, width: int) -> None:
+    """Set the size of a pseudo-terminal."""
+    fcntl.ioctl(fd, termios.TIOCSWINSZ, struct.pack("HHHH", height, width, 0, 0))
+
+
+def test_render_clips_to_terminal(terminal: List[int], pipe: List[int]) -> None:
+    """Test that lines below the terminal are not written."""
+    controller, fd = terminal
+    resize(fd, 3, 10)
+    renderer = cuia.renderer.AnsiRenderer(stdin=pipe[0], stdout=fd)
+    renderer.render("a\nb\nc\nd\ne")
+
+    output = os.read(controller, 1024)
+    assert b"c" in output
+    assert b"d" not in output
+
+
+def test_next_event_reports_resize(terminal: List[int], pipe: List[int]) -> None:
+    """Test that a change in the terminal size is reported and forces a redraw."""
+    controller, fd = terminal
+    resize(fd, 3, 10)
+    renderer = cuia.renderer.AnsiRenderer(stdin=pipe[0], stdout=fd)
+    assert renderer.next_event() == Resize(3, 10)
+    renderer.render("Hello, world!")
+    assert renderer.next_event() is None
+
+    resize(fd, 5, 20)
+    assert renderer.next_event() == Resize(5, 20)
+    assert renderer.last_screen is None
@@ -1 +1,174 @@
 """Tests for the curses renderer."""
+
+
+import curses
+from curses import ascii
+from dataclasses import dataclass, field
+from typing import List, Text, Tuple
+
+from cuia.messages import Key, Resize
+from cuia.renderer.curses import KEYS, RESET, CursesRenderer
+
+
+@dataclass
+class FakeWindow:
+    """A stand-in for a curses window that records what is drawn on it."""
+
+    height: int = 24
+    width: int = 80
+    keys: List[int] = field(default_factory=list)
+    writes: List[Text] = field(default_factory=list)
+    erases: int = 0
+
+    def getmaxyx(self) -> Tuple[int, int]:
+        """Return the size of the window."""
+        return self.height, self.width
+
+    def get_wch(self) -> int:
+        """Return the next key, raising like curses does if there is none."""
+        if not self.keys:
+            raise curses.error("no input")
+        return self.keys.pop(0)
+
+    def erase(self) -> None:
+        """Record an erase."""
+        self.erases += 1
+
+    def attrset(self, attr: int) -> None:
+        """Ignore attributes."""
+
+    def addstr(self, text: Text) -> None:
+        """Record a write."""
+        self.writes.append(text)
+
+    def noutrefresh(self) -> None:
+        """Ignore refreshes."""
+
+
+def renderer(window: FakeWindow) -> Tuple[CursesRenderer, FakeWindow]:
+    """Return a renderer on a window, and the fake cusser wrapping it."""
+    cusser = FakeWindow()
+    return CursesRenderer(cusser, window), cusser  # type: ignore
+
+
+def test_fixed_keys() -> None:
+    """Test that special keys map to their events."""
+    assert KEYS[curses.KEY_LEFT] == Key.LEFT
+    assert KEYS[ascii.CR] == KEYS[ascii.NL] == KEYS[curses.KEY_ENTER] == Key.ENTER
+    assert KEYS[curses.KEY_SLEFT] == Key.SHIFT(Key.LEFT)  # type: ignore
+
+
+def test_function_keys() -> None:
+    """Test that modified function keys map to their events."""
+    assert KEYS[curses.KEY_F1] == Key.F(1)
+    assert KEYS[curses.KEY_F13] == Key.SHIFT(Key.F(1))
+    assert KEYS[curses.KEY_F25] == Key.CTRL(Key.F(1))
+    assert KEYS[curses.KEY_F37] == Key.CTRL(Key.SHIFT(Key.F(1)))
+    assert KEYS[curses.KEY_F60] == Key.ALT(Key.F(12))
+
+
+def test_character_keys() -> None:
+    """Test that control and printable characters map to their events."""
+    assert KEYS[ord("a")] == Key.CHAR("a")
+    assert KEYS[ascii.ctrl(ord("c"))] == Key.CTRL("c")
+    assert ascii.ESC not in KEYS
+
+
+def test_render_plain_screen() -> None:
+    """Test that a screen without escapes is written without ANSI translation."""
+    window = FakeWindow()
+    curses_renderer, cusser = renderer(window)
+    curses_renderer.render("Hello, world!")
+
+    assert window.writes == ["Hello, world!"]
+    assert cusser.writes == []
+
+
+def test_render_escape_mid_screen() -> None:
+    """Test that only the part from the first escape on is translated."""
+    window = FakeWindow()
+    curses_renderer, cusser = renderer(window)
+    curses_renderer.render("Hello, \033[1mworld\033[m!")
+
+    assert window.writes == ["Hello, "]
+    assert cusser.writes == [RESET + "\033[1mworld\033[m!"]
+
+
+def test_render_escape_at_start() -> None:
+    """Test that a screen starting with an escape is all translated."""
+    window = FakeWindow()
+    curses_renderer, cusser = renderer(window)
+    curses_renderer.render("\033[1mHello, world!")
+
+    assert window.writes == []
+    assert cusser.writes == [RESET + "\033[1mHello, world!"]
+
+
+def test_stdscr_only() -> None:
+    """Test that a renderer given only a wrapped window draws on it."""
+    cusser = FakeWindow()
+    curses_renderer = CursesRenderer(cusser)  # type: ignore
+    curses_renderer.render("Hello, world!")
+
+    assert curses_renderer.window is cusser
+    assert cusser.writes == ["Hello, world!"]
+
+
+def test_render_clips_lines() -> None:
+    """Test that lines below the window are not drawn."""
+    window = FakeWindow(height=3, width=10)
+    curses_renderer, _ = renderer(window)
+    curses_renderer.render("a\nb\nc\nd\ne")
+
+    assert window.writes == ["a\nb\nc"]
+
+
+def test_render_clips_wrapped_lines() -> None:
+    """Test that lines wider than the window count as the rows they take."""
+    window = FakeWindow(height=3, width=10)
+    curses_renderer, cusser = renderer(window)
+    curses_renderer.render("0123456789012345\nx\ny")
+    curses_renderer.render("x" * 40)
+    curses_renderer.render("\033[1m" + "x" * 40)
+
+    # The last screen does not fit and cannot be cut, so nothing is left of it
+    assert window.writes == ["0123456789012345\nx", "x" * 29, ""]
+    assert cusser.writes == []
+
+
+def test_render_skips_same_screen() -> None:
+    """Test that a screen is not drawn again until the window is resized."""
+    window = FakeWindow()
+    curses_renderer, _ = renderer(window)
+    curses_renderer.render("Hello, world!")
+    curses_renderer.render("Hello, world!")
+
+    assert window.erases == 1
+    assert window.writes == ["Hello, world!"]
+
+    window.keys.append(curses.KEY_RESIZE)
+    assert curses_renderer.next_event() == Resize(24, 80)
+    curses_renderer.render("Hello, world!")
+
+    assert window.erases == 2
+    assert window.writes == ["Hello, world!", "Hello, world!"]
+
+
+def test_next_event_escape() -> None:
+    """Test that an escape alone is escape, and before a key it means alt."""
+    window = FakeWindow(keys=[ascii.ESC, ord("x"), ascii.ESC])
+    curses_renderer, _ = renderer(window)
+
+    assert curses_renderer.next_event() == Key.ALT(Key.CHAR("x"))
+    assert curses_renderer.next_event() == Key.ESCAPE
+    assert curses_renderer.next_event() is None
+
+
+def test_render_clips_tabs() -> None:
+    """Test that tabs count as the columns up to the next tab stop."""
+    window = FakeWindow(height=3, width=10)
+    curses_renderer, _ = renderer(window)
+    curses_renderer.render("a\tb\tc\td\te\n1\n2")
+    curses_renderer.render("\t" * 8)
+
+    assert window.writes == ["a\tb\tc\td\te", "\t" * 5]
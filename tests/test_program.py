@@ -1,8 +1,14 @@
 """Tests for the program class."""
 
-from typing import Optional, Text
+import asyncio
+from asyncio import Queue
+from dataclasses import dataclass, field
+from typing import List, Optional, Text
+
+import pytest
 
 import cuia
+from cuia.messages import Event
 
 
 class Hello(cuia.Store):
@@ -32,3 +38,88 @@ def test_program_renderer() -> None:
 
     assert isinstance(program.renderer, cuia.renderer.LogRenderer)
     assert Text(program.store) == "Hello, world!"
+
+
+def test_program_messages() -> None:
+    """Test that messages are handled in order without awaiting."""
+    program = cuia.Program(Hello(), cuia.renderer.TextRenderer())
+    program.messages = Queue()
+
+    program.enqueue_message(cuia.Key.CHAR("a"))
+    program.enqueue_message(cuia.Quit())
+
+    message = program.dequeue_message()
+    assert message is not None
+    program.handle_message(message)
+    assert not program.should_quit
+
+    message = program.dequeue_message()
+    assert message is not None
+    program.handle_message(message)
+    assert program.should_quit
+    assert program.dequeue_message() is None
+
+
+def test_program_fps() -> None:
+    """Test that the frame rate must be positive."""
+    with pytest.raises(ValueError):
+        cuia.Program(Hello(), cuia.renderer.TextRenderer(), fps=0)
+    with pytest.raises(ValueError):
+        cuia.Program(Hello(), cuia.renderer.TextRenderer(), fps=-1)
+
+
+class Blank(cuia.Store):
+    """A program that shows nothing and exits on the usual keys."""
+
+    def __str__(self) -> Text:
+        """Return nothing."""
+        return ""
+
+
+@dataclass
+class SlowRenderer(cuia.renderer.TextRenderer):
+    """A renderer that spends some time on each frame, then asks to quit."""
+
+    clock: List[float] = field(default_factory=lambda: [0.0])
+    """The current time, advanced by the work done on each frame."""
+
+    costs: List[float] = field(default_factory=list)
+    """The time spent on each frame, in order."""
+
+    quitting: bool = False
+    """An indicator that the quit key was already sent."""
+
+    def render(self, screen: Text) -> None:
+        """Render nothing."""
+
+    def next_event(self) -> Optional[Event]:
+        """Spend the time of a frame, or send the quit key once frames run out."""
+        if self.costs:
+            self.clock[0] += self.costs.pop(0)
+            return None
+        if not self.quitting:
+            self.quitting = True
+            return cuia.Key.CHAR("q")
+        return None
+
+
+def test_program_pacing(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test that each frame waits for whatever is left of its time slot."""
+    renderer = SlowRenderer(costs=[0.01, 0.02, 0.08])
+    delays: List[float] = []
+    yield_control = asyncio.sleep
+
+    async def sleep(delay: float) -> None:
+        # Let time pass instantly, but still let other tasks run
+        delays.append(delay)
+        renderer.clock[0] += delay
+        await yield_control(0)
+
+    monkeypatch.setattr(asyncio.BaseEventLoop, "time", lambda _: renderer.clock[0])
+    monkeypatch.setattr(asyncio, "sleep", sleep)
+    asyncio.run(cuia.Program(Blank(), renderer, fps=20).start())
+
+    # Frames are 0.05 seconds apart. The third one takes longer than that, so it
+    # does not wait at all, and the next one gets a whole slot again instead of
+    # trying to catch up.
+    assert delays == pytest.approx([0.04, 0.03, 0.0, 0.05, 0.05])